@@ -2,26 +2,72 @@
 import pymcl
 import hashlib
 import math
+from functools import lru_cache
+
+FR_BYTES = (pymcl.r.bit_length() + 7) // 8  # size of a serialized Fr element
+
+def int_to_fr(value: int) -> pymcl.Fr:
+    """
+    Convert an integer to a Fr element, reducing it modulo r.
+
+    Uses the little-endian serialization of Fr rather than a decimal string round-trip.
+    """
+    return pymcl.Fr.deserialize((value % pymcl.r).to_bytes(FR_BYTES, byteorder='little'))
+
+def fr_to_int(value: pymcl.Fr) -> int:
+    """Convert a Fr element to its integer representative in [0, r)."""
+    return int.from_bytes(value.serialize(), byteorder='little')
+
+def expand_message_xmd(msg: bytes, dst: bytes, len_in_bytes: int) -> bytes:
+    """
+    Expand a message to len_in_bytes uniformly random bytes with SHA-256.
+
+    Implements expand_message_xmd from RFC 9380 Section 5.3.1.
+
+    :param msg: Message to expand.
+    :param dst: Domain separation tag, at most 255 bytes.
+    :param len_in_bytes: Number of output bytes, at most 255 * 32.
+    :return: The expanded bytes.
+    """
+    b_in_bytes = hashlib.sha256().digest_size
+    s_in_bytes = hashlib.sha256().block_size
+    ell = -(-len_in_bytes // b_in_bytes)
+    if ell > 255 or len_in_bytes > 65535 or len(dst) > 255:
+        raise ValueError("Invalid parameters for expand_message_xmd.")
+
+    dst_prime = dst + len(dst).to_bytes(1, byteorder='big')
+    z_pad = bytes(s_in_bytes)
+    l_i_b_str = len_in_bytes.to_bytes(2, byteorder='big')
+    msg_prime = z_pad + msg + l_i_b_str + b'\x00' + dst_prime
+
+    b_0 = hashlib.sha256(msg_prime).digest()
+    b_i = hashlib.sha256(b_0 + b'\x01' + dst_prime).digest()
+    uniform_bytes = b_i
+    for i in range(2, ell + 1):
+        b_i = hashlib.sha256(bytes(x ^ y for x, y in zip(b_0, b_i)) + i.to_bytes(1, byteorder='big') + dst_prime).digest()
+        uniform_bytes += b_i
+    return uniform_bytes[:len_in_bytes]
+
+HASH_TO_FR_DST = b"SWE-V01-CS01-with-BLS12381G2_XMD:SHA-256_HASH-TO-FR_"
+HASH_TO_FR_LEN = 48  # L = ceil((ceil(log2(r)) + 128) / 8) for 128-bit security
 
 def hash_g2_to_fr(value: pymcl.G2) -> pymcl.Fr:
     """
     Hash a G2 element to a Fr element.
-    
-    Warning: This is a naive implementation and does not provide uniformly distributed outputs.
-    Consider using a method based on RFC 9380 Section 5."""
+
+    Follows hash_to_field from RFC 9380 Section 5.2: the input is expanded to 48 bytes,
+    so that reducing modulo r leaves a negligible bias.
+    """
     p = pymcl.r  # modulus of the field Fr
-    
-    # Hash the key to bytes using SHA-256
-    h = hashlib.sha256(repr(value).encode()).digest()
 
-    # Convert to integer
-    h_int = int.from_bytes(h, byteorder='big')
+    # Expand the serialized key to L bytes using SHA-256
+    uniform_bytes = expand_message_xmd(value.serialize(), HASH_TO_FR_DST, HASH_TO_FR_LEN)
 
-    # Map to 0..p-1
-    x_int = (h_int % p) 
+    # Convert to integer and map to 0..p-1
+    x_int = int.from_bytes(uniform_bytes, byteorder='big') % p
 
     # Convert to Fr
-    x_fr = pymcl.Fr(str(x_int))
+    x_fr = int_to_fr(x_int)
 
     return x_fr
 
@@ -33,14 +79,33 @@ def pow_fr(base: pymcl.Fr, exponent: int) -> pymcl.Fr:
     :param exponent: Exponent (non-negative integer).
     :return: Result of base^exponent.
     """
-    if exponent == 0:
-        return pymcl.Fr("1")
-    elif exponent % 2 == 0:
-        half = pow_fr(base, exponent // 2)
-        return half * half
-    else:
-        half = pow_fr(base, (exponent - 1) // 2)
-        return half * half * base
+    # Iterative square-and-multiply over the bits of the exponent
+    result = pymcl.Fr("1")
+    while exponent:
+        if exponent & 1:
+            result = result * base
+        base = base * base
+        exponent >>= 1
+    return result
+
+def batch_inverse_fr(values: list[pymcl.Fr]) -> list[pymcl.Fr]:
+    """
+    Invert a list of non-zero Fr elements with a single field inversion (Montgomery's trick).
+
+    :param values: List of non-zero Fr elements.
+    :return: List of the inverses, in the same order as values.
+    """
+    # prefix[i] holds the product of values[0..i-1]
+    prefix = [pymcl.Fr("1")]
+    for v in values:
+        prefix.append(prefix[-1] * v)
+
+    inv = pymcl.Fr("1") / prefix[-1]
+    inverses = [None] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = inv * prefix[i]
+        inv = inv * values[i]
+    return inverses
 
 def eval_polynomial(value: pymcl.Fr, coefficients: list[pymcl.Fr]) -> pymcl.Fr:
     """
@@ -50,25 +115,105 @@ def eval_polynomial(value: pymcl.Fr, coefficients: list[pymcl.Fr]) -> pymcl.Fr:
     :param coefficients: List of coefficients of the polynomial.
     :return: The evaluated polynomial.
     """
+    # Horner's rule: n multiplications instead of recomputing value^i per term
     result = pymcl.Fr("0")
-    for i, coeff in enumerate(coefficients):
-        result += coeff * (pow_fr(value, i))
+    for coeff in reversed(coefficients):
+        result = result * value + coeff
     return result
 
-def build_baby_step_table(base: pymcl.GT, max_value: int) -> dict[int,pymcl.GT]:
+def multi_scalar_mul(points: list, scalars: list[pymcl.Fr]):
+    """
+    Compute the multi-scalar multiplication sum_i points[i] * scalars[i].
+
+    Works for points in G1 or G2. Each term uses pymcl's native scalar multiplication:
+    a Pippenger bucket method written in Python is slower at every size measured,
+    since a Python-level group addition costs about 1/50 of a native scalar multiplication.
+
+    :param points: Non-empty list of group elements.
+    :param scalars: List of Fr scalars, one per point.
+    :return: The group element sum_i points[i] * scalars[i].
+    """
+    if len(points) != len(scalars) or not points:
+        raise ValueError("Multi-scalar multiplication needs the same non-zero number of points and scalars.")
+
+    result = points[0] * scalars[0]
+    for i in range(1, len(points)):
+        result = result + points[i] * scalars[i]
+    return result
+
+TABLE_KEY_BYTES = 8  # prefix of the GT serialization used as baby-step table key
+
+def build_fixed_base_table(base) -> list[list]:
+    """
+    Precompute a fixed-base table for fast scalar multiplications of a G1 or G2 element.
+
+    Row i holds d * 256^i * base for every byte value d, so a scalar multiplication reduces
+    to one group addition per byte of the scalar, see fixed_base_mul.
+
+    :param base: The fixed group element.
+    :return: The table, FR_BYTES rows of 256 group elements.
+    """
+    table = []
+    for _ in range(FR_BYTES):
+        row = [type(base)()]  # neutral element of G1 or G2
+        for d in range(1, 256):
+            row.append(row[-1] + base)
+        table.append(row)
+        base = row[-1] + base  # 256^(i+1) * base
+    return table
+
+def fixed_base_mul(table: list[list], scalar: pymcl.Fr):
+    """
+    Multiply the base of a fixed-base table by a scalar.
+
+    :param table: Table built by build_fixed_base_table.
+    :param scalar: Fr scalar.
+    :return: The group element scalar * base.
+    """
+    result = table[0][0]
+    # The little-endian serialization of the scalar gives its base-256 digits
+    for row, d in zip(table, scalar.serialize()):
+        if d:
+            result = result + row[d]
+    return result
+
+def _table_key(value: pymcl.GT) -> int:
+    """
+    Key under which a GT element is stored in the baby-step table.
+
+    Only an 8-byte prefix of the 576-byte serialization is kept, read as an integer,
+    so a hit must be confirmed against the full element, see discrete_log.
+    """
+    return int.from_bytes(value.serialize()[:TABLE_KEY_BYTES], byteorder='little')
+
+@lru_cache(maxsize=None)
+def _giant_step_factor(base: pymcl.GT, m: int) -> pymcl.GT:
+    """Compute base^(-m), shared by all discrete_log calls with the same base and table."""
+    return base ** int_to_fr(-m)
+
+def build_baby_step_table(base: pymcl.GT, max_value: int, table_size: int | None = None) -> dict[int,int]:
     """
     Build the baby-step table for the baby-step-giant-step algorithm.
 
+    The table is built once and reused for every discrete log, so a table larger than
+    sqrt(max_value) trades setup time and memory for fewer giant steps per lookup.
+
     :param base: The base point in the elliptic curve group GT.
     :param max_value: The maximum value for the discrete logarithm (e.g. 2**24).
-    :return: A dictionary representing the baby-step table.
+    :param table_size: Number of baby steps, defaults to sqrt(max_value).
+    :return: A dictionary mapping truncated serializations of base^j to j.
     """
+    # Two baby steps with the same truncated key are stored under consecutive keys
+    # (linear probing), so that discrete_log can find both
     #m = max_value
-    m = math.isqrt(max_value) + 1
+    m = table_size if table_size is not None else math.isqrt(max_value) + 1
     baby_steps = {}
-    current = base / base # neutral element
+    current = pymcl.GT() # neutral element
     for j in range(m):
-        baby_steps[current] = j
+        key = _table_key(current)
+        while key in baby_steps:
+            key += 1
+        baby_steps[key] = j
         current *= base
     
     return baby_steps
@@ -79,24 +224,32 @@ def discrete_log(value: pymcl.GT, base: pymcl.GT, baby_steps: dict, max_value: i
 
     :param value: The point in the elliptic curve group GT to compute the dlog of.
     :param base: The base point in the elliptic curve group G1.
-    :param modulus: The order of the elliptic curve group.
-    :param baby_steps: The precomputed baby-step table.
+    :param baby_steps: The precomputed baby-step table, see build_baby_step_table.
+    :param max_value: The maximum value for the discrete logarithm.
     :return: The discrete logarithm x such that base * x = value.
     """
 
-    # Define the maximum value for the discrete log
-    m = math.isqrt(max_value) + 1
+    # The giant-step stride is the number of baby steps, enough giant steps to cover max_value
+    m = len(baby_steps)
+    giant_steps = -(-max_value // m)
 
     # Compute the giant-step factor
-    factor = base ** (pymcl.Fr(str(-m)))  # Negate and scale the base point
+    factor = _giant_step_factor(base, m)  # Negate and scale the base point
 
     # Perform the giant steps
     current = value
-    for i in range(m):
+    for i in range(giant_steps):
         #print(f"Current value at step {i}: {current}")
-        if current in baby_steps:
+        key = _table_key(current)
+        j = baby_steps.get(key)  # a single dict lookup per giant step
+        while j is not None:
             #print(f"Match found: {current}")
-            return pymcl.Fr(str(i * m + baby_steps[current]))
+            # Keys are truncated, so confirm the match on the full element
+            # and probe the following keys on a collision
+            if base ** int_to_fr(j) == current:
+                return int_to_fr(i * m + j)
+            key += 1
+            j = baby_steps.get(key)
         current *= factor  # Elliptic curve point addition
 
     # If no solution is found
@@ -118,8 +271,8 @@ def message_to_pymcl_fr(message: str, msg_lengths: int) -> list[pymcl.Fr]:
     chunk_size = msg_lengths // 8  # Convert bits to bytes
     chunks = [message_bytes[i:i + chunk_size] for i in range(0, len(message_bytes), chunk_size)]
 
-    # Convert each chunk to a pymcl.Fr element
-    fr_elements = [pymcl.Fr(str(int.from_bytes(chunk, byteorder='big'))) for chunk in chunks]
+    # Convert each chunk to a pymcl.Fr element, straight from its little-endian bytes
+    fr_elements = [pymcl.Fr.deserialize(chunk[::-1].ljust(FR_BYTES, b'\x00')) for chunk in chunks]
 
     return fr_elements
 
@@ -132,11 +285,14 @@ def pymcl_fr_to_message(fr_elements: list[pymcl.Fr], msg_lengths: int) -> str:
     :param msg_lengths: The maximum number of bits for each pymcl.Fr element.
     :return: The reconstructed message as a string.
     """
-    # Convert each pymcl.Fr element to an integer and then to bytes
+    # Read each chunk from the little-endian serialization of its pymcl.Fr element
     chunk_size = msg_lengths // 8  # Convert bits to bytes
-    message_bytes = b''.join(
-        int(fr.__str__()).to_bytes(chunk_size, byteorder='big').lstrip(b'\x00') for fr in fr_elements
-    )
+    chunks = [fr.serialize()[:chunk_size][::-1] for fr in fr_elements]
+
+    # Every chunk but the last one is full, so only the last one carries zero padding
+    if chunks:
+        chunks[-1] = chunks[-1].lstrip(b'\x00')
+    message_bytes = b''.join(chunks)
 
     # Decode the bytes back to a string
     return message_bytes.decode()
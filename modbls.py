@@ -5,6 +5,20 @@ Requires pymcl library for pairing operations, see https://github.com/Jemtaly/py
 """
 import pymcl
 import ecutils
+from functools import lru_cache
+
+@lru_cache(maxsize=1024)
+def hash_to_g1(message: str) -> pymcl.G1:
+    """
+    Hash a message to G1.
+
+    Results are cached, since the same message is hashed by sign, verify and the SWE
+    encryption for every key and ciphertext.
+
+    :param message: Message to hash.
+    :return: Hash of the message in G1.
+    """
+    return pymcl.G1.hash(message.encode())
 
 def key_gen() -> tuple[pymcl.Fr, pymcl.G2]:
     """
@@ -24,7 +38,7 @@ def sign(sk: pymcl.Fr, message: str) -> pymcl.G1:
     :param message: Message to sign.
     :return: Signature.
     """
-    h = pymcl.G1.hash(message.encode())
+    h = hash_to_g1(message)
     sig = h * sk
     return sig
 
@@ -37,7 +51,7 @@ def verify(vk: pymcl.G2, message: str, sig: pymcl.G1) -> bool:
     :param sig: Signature to verify.
     :return: True if the signature is valid, False otherwise.
     """
-    h = pymcl.G1.hash(message.encode())
+    h = hash_to_g1(message)
     return pymcl.pairing(sig, pymcl.g2) == pymcl.pairing(h, vk)
 
 def agg_sigs(sigs: list[pymcl.G1], ver_keys: list[pymcl.G2]) -> pymcl.G1:
@@ -49,10 +63,8 @@ def agg_sigs(sigs: list[pymcl.G1], ver_keys: list[pymcl.G2]) -> pymcl.G1:
     :return: Aggregated signature.
     """
     xi = [ecutils.hash_g2_to_fr(ver_keys[i]) for i in range(len(ver_keys))]
-    agg_sig = pymcl.g1 - pymcl.g1 # Initialize to neutral element of G1
-    for i in range(len(ver_keys)):
-        li = compute_li(xi, i)
-        agg_sig += sigs[i] * li
+    lis = compute_all_li(xi)
+    agg_sig = ecutils.multi_scalar_mul(sigs, lis)
     
     return agg_sig
 
@@ -69,12 +81,24 @@ def agg_verify(agg_sig: pymcl.G1, messages: list[str], ver_keys: list[pymcl.G2])
         raise ValueError("Number of messages must match number of verification keys.")
     
     xi = [ecutils.hash_g2_to_fr(ver_keys[i]) for i in range(len(ver_keys))]
-    lhs = pymcl.pairing(agg_sig, pymcl.g2)
-    rhs = pymcl.pairing(pymcl.g1 - pymcl.g1, pymcl.g2 - pymcl.g2) # Initialize to neutral element of GT
+    lis = compute_all_li(xi)
+    # Group the keys by message: prod_i e(h, vk_i)^li = e(h, sum_i vk_i * li),
+    # so every distinct message costs a single pairing
+    groups: dict[str, list[int]] = {}
     for i in range(len(messages)):
-        h = pymcl.G1.hash(messages[i].encode())
-        pair = pymcl.pairing(h, ver_keys[i])
-        rhs *= pair ** compute_li(xi, i)
+        groups.setdefault(messages[i], []).append(i)
+
+    lhs = pymcl.pairing(agg_sig, pymcl.g2)
+    rhs = pymcl.GT() # Initialize to neutral element of GT
+    for message, indices in groups.items():
+        h = hash_to_g1(message)
+        if len(indices) == 1:
+            # e(h, vk)^li = e(h * li, vk): a G1 scalar multiplication is cheaper than a G2 one
+            i = indices[0]
+            rhs *= pymcl.pairing(h * lis[i], ver_keys[i])
+        else:
+            vk_m = ecutils.multi_scalar_mul([ver_keys[i] for i in indices], [lis[i] for i in indices])
+            rhs *= pymcl.pairing(h, vk_m)
     return lhs == rhs
 
 def compute_li(xi: list[pymcl.Fr], i: int) -> pymcl.Fr:
@@ -89,4 +113,38 @@ def compute_li(xi: list[pymcl.Fr], i: int) -> pymcl.Fr:
     for j in range(len(xi)):
         if i != j:
             li *= (-xi[j]) / (xi[i] - xi[j])
-    return li
\ No newline at end of file
+    return li
+
+def compute_all_li(xi: list[pymcl.Fr]) -> list[pymcl.Fr]:
+    """
+    Compute the Lagrange coefficients for all indices at once.
+
+    Equivalent to [compute_li(xi, i) for i in range(len(xi))], but the
+    denominators are inverted together with a single field inversion.
+
+    :param xi: List of xi values.
+    :return: List of Lagrange coefficients.
+    """
+    n = len(xi)
+
+    # Numerators prod_{j != i} (-xi[j]) from shared prefix and suffix products
+    neg_xi = [-x for x in xi]
+    prefix = [pymcl.Fr("1")]
+    for x in neg_xi:
+        prefix.append(prefix[-1] * x)
+    suffix = [pymcl.Fr("1")]
+    for x in reversed(neg_xi):
+        suffix.append(suffix[-1] * x)
+    suffix.reverse()  # suffix[i] holds the product of neg_xi[i..n-1]
+    numerators = [prefix[i] * suffix[i + 1] for i in range(n)]
+
+    denominators = []
+    for i in range(n):
+        den = pymcl.Fr("1")
+        for j in range(n):
+            if i != j:
+                den *= xi[i] - xi[j]
+        denominators.append(den)
+
+    inv_denominators = ecutils.batch_inverse_fr(denominators)
+    return [num * inv for num, inv in zip(numerators, inv_denominators)]
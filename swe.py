@@ -5,6 +5,10 @@ Requires pymcl library for pairing operations, see https://github.com/Jemtaly/py
 """
 
 from typing import NamedTuple
+from concurrent.futures import Executor
+from itertools import repeat
+from operator import itemgetter
+import os
 import random
 from pprint import pprint
 import pymcl
@@ -13,6 +17,15 @@ import modbls
 from time import perf_counter_ns as timer
 from prettytable import *
 
+# Fixed-base table for the generator g2, used for every g2 scalar multiplication in encrypt
+_G2_TABLE = ecutils.build_fixed_base_table(pymcl.g2)
+
+# Generator of GT, the base for message encoding and the decryption discrete logs
+_GT_GEN = pymcl.pairing(pymcl.g1, pymcl.g2)
+
+# Below this many items, a parallel map costs more in process round trips than it saves
+_MIN_PARALLEL_ITEMS = 4
+
 class Ciphertext(NamedTuple):
     """Ciphertext of SWE scheme."""
 
@@ -30,6 +43,7 @@ def encrypt(
     ver_keys: list[pymcl.G2],
     target_message: str,
     messages: list[pymcl.Fr],
+    executor: Executor | None = None,
 ) -> Ciphertext:
     """
     Encrypt a list of messages using signature-based witness encryption (SWE)
@@ -39,6 +53,7 @@ def encrypt(
     :param ver_keys: List of verification keys.
     :param target_message: Messages that needs to be signed to allow decryption.
     :param messages: List of messages to encrypt. We require each message to be in [0, 2^msg_lengths) for some msg_lengths for decryption.
+    :param executor: Optional executor (e.g. a ProcessPoolExecutor) to encrypt the messages in parallel.
     :return: Ciphertext.
     """
     coefficients: list[pymcl.Fr] = [pymcl.Fr.random() for _ in range(dec_threshold)]
@@ -46,20 +61,35 @@ def encrypt(
     s: list[pymcl.Fr]  = [ecutils.eval_polynomial(xi[i], coefficients) for i in range(len(ver_keys))]
     alpha: list[pymcl.Fr] = [pymcl.Fr.random() for _ in range(len(messages))]
     r: pymcl.Fr = pymcl.Fr.random()
-    c: pymcl.Fr = pymcl.g2 * r
-    a: list[pymcl.G2] =  [c * alpha[i] for i in range(len(messages))]
-    t: list[pymcl.G1] = [pymcl.G1.hash(target_message.encode())*alpha[i] for i in range(len(messages))] 
-    h: pymcl.G2 =  pymcl.g2 * pymcl.Fr.random()
-    c0: pymcl.G2 = (h * r) + (pymcl.g2 * coefficients[0])
-    c1: list[pymcl.G2] = [(ver_keys[i] * r) + (pymcl.g2 * s[i]) for i in range(len(ver_keys))]
-    gt: pymcl.GT = pymcl.pairing(pymcl.g1, pymcl.g2)
-    c2: list[pymcl.GT] = [
-        pymcl.pairing(t[i], pymcl.g2 * coefficients[0]) * (gt ** messages[i])
-        for i in range(len(messages))
-    ]
+    c: pymcl.Fr = ecutils.fixed_base_mul(_G2_TABLE, r)
+    h_target: pymcl.G1 = modbls.hash_to_g1(target_message)
+    h: pymcl.G2 =  ecutils.fixed_base_mul(_G2_TABLE, pymcl.Fr.random())
+    g2_c0: pymcl.G2 = ecutils.fixed_base_mul(_G2_TABLE, coefficients[0])
+    c0: pymcl.G2 = (h * r) + g2_c0
+    c1: list[pymcl.G2] = _map(executor, _encrypt_key, ver_keys, s, repeat(r))
+    # e(t[i], g2_c0) = e(h_target, g2_c0)^alpha[i]: one pairing, then a GT exponentiation per message
+    target_gt: pymcl.GT = pymcl.pairing(h_target, g2_c0)
+    parts = _map(executor, _encrypt_message, alpha, messages, repeat(r), repeat(h_target), repeat(target_gt))
+    a: list[pymcl.G2] = [p[0] for p in parts]
+    t: list[pymcl.G1] = [p[1] for p in parts]
+    c2: list[pymcl.GT] = [p[2] for p in parts]
 
     return Ciphertext(h, c, c0, c1, c2, a, t)
 
+def _encrypt_key(ver_key: pymcl.G2, s_i: pymcl.Fr, r: pymcl.Fr) -> pymcl.G2:
+    """Compute the ciphertext component c1 for one verification key."""
+    return (ver_key * r) + ecutils.fixed_base_mul(_G2_TABLE, s_i)
+
+def _encrypt_message(
+    alpha_i: pymcl.Fr, message: pymcl.Fr, r: pymcl.Fr, h_target: pymcl.G1, target_gt: pymcl.GT
+) -> tuple[pymcl.G2, pymcl.G1, pymcl.GT]:
+    """Compute the ciphertext components a, t and c2 for one message."""
+    # c * alpha[i] = g2 * (r * alpha[i]), which can use the fixed-base table for g2
+    a_i = ecutils.fixed_base_mul(_G2_TABLE, r * alpha_i)
+    t_i = h_target * alpha_i
+    c2_i = (target_gt ** alpha_i) * (_GT_GEN ** message)
+    return a_i, t_i, c2_i
+
 
 def decrypt(
     ctxt: Ciphertext,
@@ -67,7 +97,8 @@ def decrypt(
     ver_keys: list[pymcl.G2],
     used_vk_indices: list[int],
     msg_lengths: int,
-    baby_steps_table: dict[int,pymcl.GT],
+    baby_steps_table: dict[int,int],
+    executor: Executor | None = None,
 ) -> list[pymcl.Fr]:
     """
     Decrypt a SWE ciphertext.
@@ -77,6 +108,8 @@ def decrypt(
     :param ver_keys: List of all verification keys.
     :used_vk_indices: Sorted list of indices of ver_keys used for the signature.
     :param msg_lengths: Length of the messages such that each message is in [0, 2^msg_lengths).
+    :param baby_steps_table: Baby-step table for base pairing(g1, g2), see ecutils.build_baby_step_table.
+    :param executor: Optional executor (e.g. a ProcessPoolExecutor) to decrypt the messages in parallel.
     :return: List of messages.
     """
 
@@ -84,17 +117,15 @@ def decrypt(
     #    raise ValueError("Not enough signatures to decrypt the message.")
     
     xi: list[pymcl.Fr] = [ecutils.hash_g2_to_fr(ver_keys[i]) for i in used_vk_indices] #iterate through used_vk_indices
-    lag_coeffs: list[pymcl.Fr] = [modbls.compute_li(xi, i) for i in range(len(used_vk_indices))]
-    c = pymcl.g2 - pymcl.g2  
-    for idx, i in enumerate(used_vk_indices):
-        c = c + (ctxt.c1[i] * lag_coeffs[idx]) #indexing lag_coeffs correctly
-
-    z: list[pymcl.GT] = [
-        ctxt.c2[i] * pymcl.pairing(aggr_signature, ctxt.a[i]) / pymcl.pairing(ctxt.t[i], c)
-        for i in range(len(ctxt.c2))
-    ]
-    gt = pymcl.pairing(pymcl.g1, pymcl.g2)  # generator point of GT
-    msg: list[pymcl.Fr] = [ecutils.discrete_log(z[i], gt, baby_steps_table, 2**msg_lengths) for i in range(len(z))]
+    lag_coeffs: list[pymcl.Fr] = modbls.compute_all_li(xi)
+    c = ecutils.multi_scalar_mul([ctxt.c1[i] for i in used_vk_indices], lag_coeffs)
+
+    # e(t_i, c)^-1 = e(t_i, -c): negate the shared c once instead of a GT division per message
+    neg_c = -c
+    msg: list[pymcl.Fr] = _map(
+        executor, _decrypt_message, ctxt.c2, ctxt.a, ctxt.t,
+        repeat(aggr_signature), repeat(neg_c), repeat(baby_steps_table), repeat(2**msg_lengths),
+    )
 
     for i in range(len(msg)):
         if msg[i] is None:
@@ -102,6 +133,74 @@ def decrypt(
 
     return msg
 
+def _decrypt_message(
+    c2_i: pymcl.GT,
+    a_i: pymcl.G2,
+    t_i: pymcl.G1,
+    aggr_signature: pymcl.G1,
+    neg_c: pymcl.G2,
+    baby_steps_table: dict[int,int],
+    max_value: int,
+) -> pymcl.Fr:
+    """Recover one message from its ciphertext components."""
+    z_i = c2_i * pymcl.pairing(aggr_signature, a_i) * pymcl.pairing(t_i, neg_c)
+    return ecutils.discrete_log(z_i, _GT_GEN, baby_steps_table, max_value)
+
+class _Serialized(NamedTuple):
+    """A pymcl element in serialized form, since pymcl objects cannot be pickled."""
+
+    cls: type
+    data: bytes
+
+def _pack(value):
+    """Replace pymcl elements (also inside tuples) by their serialized form."""
+    if isinstance(value, (pymcl.Fr, pymcl.G1, pymcl.G2, pymcl.GT)):
+        return _Serialized(type(value), value.serialize())
+    if isinstance(value, tuple):
+        return tuple(_pack(v) for v in value)
+    return value
+
+def _unpack(value):
+    """Inverse of _pack."""
+    if isinstance(value, _Serialized):
+        return value.cls.deserialize(value.data)
+    if isinstance(value, tuple):
+        return tuple(_unpack(v) for v in value)
+    return value
+
+def _run_packed(fn, *args):
+    """Run fn in a worker process on packed arguments and pack its result."""
+    return _pack(fn(*(_unpack(arg) for arg in args)))
+
+def _map(executor: Executor | None, fn, *iterables) -> list:
+    """
+    Apply fn to the items of the iterables, in the executor's workers if one is given.
+
+    :param executor: Executor to run in, or None to run serially.
+    :param fn: Module-level function, so that it can be sent to worker processes.
+    :param iterables: Argument iterables, as for map; at least one must be finite.
+    :return: List of results.
+    """
+    items = list(zip(*iterables))
+    if executor is None or len(items) < _MIN_PARALLEL_ITEMS:
+        return [fn(*args) for args in items]
+
+    # One chunk per CPU, so that arguments shared by all items are sent once per chunk
+    chunksize = max(1, -(-len(items) // (os.cpu_count() or 1)))
+    packed = [[_pack(arg) for arg in args] for args in items]
+    results = executor.map(_run_packed, repeat(fn), *zip(*packed), chunksize=chunksize)
+    return [_unpack(result) for result in results]
+
+def _select_keys(
+    sks: list[pymcl.Fr], ver_keys: list[pymcl.G2], indices: list[int]
+) -> tuple[list[pymcl.Fr], list[pymcl.G2]]:
+    """Pick the signing and verification keys at the given indices."""
+    getter = itemgetter(*indices)
+    if len(indices) == 1:
+        # itemgetter with a single index returns the item itself, not a tuple
+        return [getter(sks)], [getter(ver_keys)]
+    return list(getter(sks)), list(getter(ver_keys))
+
 def run_benchmark():
     # Print table with benchmark results
     msg_lengths_list = [16, 24]
@@ -123,7 +222,22 @@ def run_benchmark():
         "Dec Time (ms)",
     ]
 
+    # Generate one pool of keys, every configuration uses the first num_keys of them;
+    # each key generation is timed so that it still counts towards the setup time
+    key_pool = []
+    key_gen_times = []
+    for _ in range(max(num_keys_list)):
+        start_time = timer()
+        key_pool.append(modbls.key_gen())
+        key_gen_times.append(timer() - start_time)
+
     for msg_lengths in msg_lengths_list:
+        # The baby-step table only depends on msg_lengths
+        start_time = timer()
+        baby_steps_table = ecutils.build_baby_step_table(_GT_GEN, 2**msg_lengths)
+        end_time = timer()
+        table_time = (end_time - start_time)
+
         for num_keys in num_keys_list:
             for dec_threshold in dec_threshold_list:
                 if dec_threshold > num_keys:
@@ -138,20 +252,12 @@ def run_benchmark():
                     target_message = "target_msg"
                     msgs = ecutils.message_to_pymcl_fr(message, msg_lengths)
 
-                    # Setup
-                    start_time = timer()
+                    # Setup: the baby-step table and the keys in use
+                    setup_time = table_time + sum(key_gen_times[:num_keys])
 
-                    gt = pymcl.pairing(pymcl.g1, pymcl.g2)  # generator point of GT
-                    baby_steps_table = ecutils.build_baby_step_table(gt, 2**msg_lengths)
-
-                    # Generate signing and verification keys
-                    modbls_keys = [modbls.key_gen() for _ in range(num_keys)]
-                    sks, ver_keys = zip(*modbls_keys)
-                    sks = list(sks)
-                    ver_keys = list(ver_keys)
-
-                    end_time = timer()
-                    setup_time = (end_time - start_time)
+                    # Signing and verification keys from the pool
+                    sks = [k[0] for k in key_pool[:num_keys]]
+                    ver_keys = [k[1] for k in key_pool[:num_keys]]
 
                     for _ in range(iterations):
                         # Encrypt messages
@@ -163,17 +269,14 @@ def run_benchmark():
                         # Sample a random subset of size threshold of keys to use for signing
                         used_key_indices = sorted(random.sample(range(num_keys), dec_threshold))
 
+                        used_sks, used_vks = _select_keys(sks, ver_keys, used_key_indices)
+
                         # Every key in used_key_indices signs the target message
                         start_time = timer()
-                        sigs = [
-                            modbls.sign(sks[used_key_indices[j]], target_message)
-                            for j in range(dec_threshold)
-                        ]
+                        sigs = [modbls.sign(sk, target_message) for sk in used_sks]
 
                         # Aggregate signatures
-                        aggregated_signature = modbls.agg_sigs(
-                            sigs, [ver_keys[used_key_indices[j]] for j in range(dec_threshold)]
-                        )
+                        aggregated_signature = modbls.agg_sigs(sigs, used_vks)
                         end_time = timer()
                         total_sig_time += (end_time - start_time)
 
@@ -232,14 +335,12 @@ def main():
     # Setup
     start_time = timer()
     
-    gt = pymcl.pairing(pymcl.g1, pymcl.g2)  # generator point of GT
-    baby_steps_table = ecutils.build_baby_step_table(gt, 2**msg_lengths)
+    baby_steps_table = ecutils.build_baby_step_table(_GT_GEN, 2**msg_lengths)
 
     # generate signing and verification keys
     modbls_keys = [modbls.key_gen() for _ in range(num_keys)]
-    sks, ver_keys = zip(*modbls_keys)
-    sks = list(sks)
-    ver_keys = list(ver_keys)
+    sks = [k[0] for k in modbls_keys]
+    ver_keys = [k[1] for k in modbls_keys]
 
     end_time = timer()
     setup_time = (end_time - start_time)
@@ -261,16 +362,15 @@ def main():
         # print("Used verification key indices:")
         # print(used_key_indices)
 
+        used_sks, used_vks = _select_keys(sks, ver_keys, used_key_indices)
+
         # every key in used_key_indices signs all messages in sign_messages
         start_time = timer()
 
-        sigs = [modbls.sign(sks[used_key_indices[j]], target_message)
-            for j in range(dec_threshold) ]
+        sigs = [modbls.sign(sk, target_message) for sk in used_sks]
 
         # aggregate signatures
-        aggregated_signature = modbls.agg_sigs(
-            sigs, [ver_keys[used_key_indices[j]] for j in range(dec_threshold)]
-        )
+        aggregated_signature = modbls.agg_sigs(sigs, used_vks)
 
         end_time = timer()
         total_sig_time += (end_time - start_time)
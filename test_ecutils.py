@@ -14,7 +14,7 @@ class TestECUtils(unittest.TestCase):
         # Verify the baby-step table contains expected values
         m = int(self.max_value**0.5) + 1
         for j in range(m):
-            current = self.base ** pymcl.Fr(str(j)) 
+            current = int.from_bytes((self.base ** pymcl.Fr(str(j))).serialize()[:ecutils.TABLE_KEY_BYTES], 'little')
             self.assertIn(current, self.baby_steps)
             self.assertEqual(self.baby_steps[current], j)
 
@@ -25,12 +25,133 @@ class TestECUtils(unittest.TestCase):
         computed_log = ecutils.discrete_log(value, self.base, self.baby_steps, self.max_value)
         self.assertEqual(computed_log, exponent)
 
+    def test_discrete_log_larger_table(self):
+        # A larger table shortens the giant-step walk but must give the same result
+        max_value = 2**16
+        baby_steps = ecutils.build_baby_step_table(self.base, max_value, table_size=1000)
+        self.assertEqual(len(baby_steps), 1000)
+        for exponent in ["0", "999", "1000", "54321", str(max_value - 1)]:
+            value = self.base ** pymcl.Fr(exponent)
+            computed_log = ecutils.discrete_log(value, self.base, baby_steps, max_value)
+            self.assertEqual(computed_log, pymcl.Fr(exponent))
+
+    def test_discrete_log_rejects_truncated_key_collision(self):
+        # Re-key the entry for j=0 under the key of a value outside the range;
+        # the lookup hits but must not be accepted without the full comparison
+        max_value = 2**8
+        baby_steps = ecutils.build_baby_step_table(self.base, max_value)
+        value = self.base ** pymcl.Fr("123456")
+        del baby_steps[int.from_bytes(pymcl.GT().serialize()[:ecutils.TABLE_KEY_BYTES], 'little')]
+        baby_steps[int.from_bytes(value.serialize()[:ecutils.TABLE_KEY_BYTES], 'little')] = 0
+        with self.assertRaises(ValueError):
+            ecutils.discrete_log(value, self.base, baby_steps, max_value)
+
+    def test_discrete_log_probes_truncated_key_collision(self):
+        # Store j=7 under the key of base^3 and move j=3 to the next slot, as if the
+        # truncated keys of base^3 and base^7 collided; base^3 must still be found
+        max_value = 2**8
+        baby_steps = ecutils.build_baby_step_table(self.base, max_value)
+        key3 = int.from_bytes((self.base ** pymcl.Fr("3")).serialize()[:ecutils.TABLE_KEY_BYTES], 'little')
+        self.assertNotIn(key3 + 1, baby_steps)
+        baby_steps[key3] = 7
+        baby_steps[key3 + 1] = 3
+        computed_log = ecutils.discrete_log(self.base ** pymcl.Fr("3"), self.base, baby_steps, max_value)
+        self.assertEqual(computed_log, pymcl.Fr("3"))
+
     def test_discrete_log_not_found(self):
         # Test for a value not in the range
         with self.assertRaises(ValueError):
             invalid_value = self.base ** (pymcl.Fr(str(self.max_value)) + pymcl.Fr("9999999"))
             ecutils.discrete_log(invalid_value, self.base, self.baby_steps, self.max_value)
 
+    def test_expand_message_xmd(self):
+        # Test vectors from RFC 9380 Appendix K.1 (expand_message_xmd with SHA-256)
+        dst = b"QUUX-V01-CS02-with-expander-SHA256-128"
+        self.assertEqual(
+            ecutils.expand_message_xmd(b"", dst, 0x20).hex(),
+            "68a985b87eb6b46952128911f2a4412bbc302a9d759667f87f7a21d803f07235",
+        )
+        self.assertEqual(
+            ecutils.expand_message_xmd(b"abc", dst, 0x20).hex(),
+            "d8ccab23b5985ccea865c6c97b6e5b8350e794e603b4b97902f53a8a0d605615",
+        )
+        self.assertEqual(
+            ecutils.expand_message_xmd(b"", dst, 0x80).hex(),
+            "af84c27ccfd45d41914fdff5df25293e221afc53d8ad2ac06d5e3e29485dadbe"
+            "e0d121587713a3e0dd4d5e69e93eb7cd4f5df4cd103e188cf60cb02edc3edf18"
+            "eda8576c412b18ffb658e3dd6ec849469b979d444cf7b26911a08e63cf31f9dc"
+            "c541708d3491184472c2c29bb749d4286b004ceb5ee6b9a7fa5b646c993f0ced",
+        )
+
+        with self.assertRaises(ValueError):
+            ecutils.expand_message_xmd(b"abc", dst, 256 * 32)
+
+    def test_hash_g2_to_fr(self):
+        vk = pymcl.g2 * pymcl.Fr.random()
+        self.assertEqual(ecutils.hash_g2_to_fr(vk), ecutils.hash_g2_to_fr(vk))
+        self.assertNotEqual(ecutils.hash_g2_to_fr(vk), ecutils.hash_g2_to_fr(vk + pymcl.g2))
+
+    def test_int_fr_conversion(self):
+        for value in [0, 1, 12345, 2**64 + 7, self.modulus - 1]:
+            fr = ecutils.int_to_fr(value)
+            self.assertEqual(fr, pymcl.Fr(str(value)))
+            self.assertEqual(ecutils.fr_to_int(fr), value)
+
+        # Integers outside [0, r) are reduced modulo r
+        self.assertEqual(ecutils.int_to_fr(-1), -pymcl.Fr("1"))
+        self.assertEqual(ecutils.int_to_fr(self.modulus + 5), pymcl.Fr("5"))
+
+    def test_pow_fr(self):
+        # Compare against repeated multiplication for small exponents
+        base = pymcl.Fr.random()
+        expected = pymcl.Fr("1")
+        for exponent in range(20):
+            self.assertEqual(ecutils.pow_fr(base, exponent), expected)
+            expected = expected * base
+
+        # Fermat's little theorem: base^(r-1) == 1 for non-zero base
+        self.assertEqual(ecutils.pow_fr(base, self.modulus - 1), pymcl.Fr("1"))
+
+    def test_batch_inverse_fr(self):
+        values = [pymcl.Fr.random() for _ in range(5)]
+        inverses = ecutils.batch_inverse_fr(values)
+        self.assertEqual(len(inverses), len(values))
+        for v, inv in zip(values, inverses):
+            self.assertEqual(v * inv, pymcl.Fr("1"))
+        self.assertEqual(ecutils.batch_inverse_fr([]), [])
+
+    def test_multi_scalar_mul(self):
+        scalars = [pymcl.Fr.random() for _ in range(4)]
+        points = [pymcl.g1 * pymcl.Fr.random() for _ in range(4)]
+        expected = pymcl.G1()
+        for p, k in zip(points, scalars):
+            expected = expected + p * k
+        self.assertEqual(ecutils.multi_scalar_mul(points, scalars), expected)
+
+        # G2 points are supported as well
+        self.assertEqual(ecutils.multi_scalar_mul([pymcl.g2], scalars[:1]), pymcl.g2 * scalars[0])
+
+        with self.assertRaises(ValueError):
+            ecutils.multi_scalar_mul([], [])
+
+    def test_fixed_base_mul(self):
+        table = ecutils.build_fixed_base_table(pymcl.g2)
+        for scalar in [pymcl.Fr("0"), pymcl.Fr("1"), pymcl.Fr("256"), -pymcl.Fr("1"), pymcl.Fr.random()]:
+            self.assertEqual(ecutils.fixed_base_mul(table, scalar), pymcl.g2 * scalar)
+
+        table = ecutils.build_fixed_base_table(pymcl.g1)
+        scalar = pymcl.Fr.random()
+        self.assertEqual(ecutils.fixed_base_mul(table, scalar), pymcl.g1 * scalar)
+
+    def test_eval_polynomial(self):
+        # p(x) = 3 + 2x + 5x^2 evaluated at x = 7
+        coefficients = [pymcl.Fr("3"), pymcl.Fr("2"), pymcl.Fr("5")]
+        result = ecutils.eval_polynomial(pymcl.Fr("7"), coefficients)
+        self.assertEqual(result, pymcl.Fr(str(3 + 2 * 7 + 5 * 7**2)))
+
+        # The empty polynomial evaluates to zero
+        self.assertEqual(ecutils.eval_polynomial(pymcl.Fr("7"), []), pymcl.Fr("0"))
+
     def test_message_to_pymcl_fr_valid(self):
         # Test conversion of a message to pymcl.Fr elements
         message = "Hello, world!"
@@ -72,6 +193,14 @@ class TestECUtils(unittest.TestCase):
         reconstructed_message = ecutils.pymcl_fr_to_message(fr_elements, msg_lengths)
         self.assertEqual(reconstructed_message, message)
 
+    def test_message_to_pymcl_fr_zero_bytes(self):
+        # Zero bytes at the start of a chunk must survive the round trip
+        message = "x\x00\x00yz"
+        msg_lengths = 16
+        fr_elements = ecutils.message_to_pymcl_fr(message, msg_lengths)
+        reconstructed_message = ecutils.pymcl_fr_to_message(fr_elements, msg_lengths)
+        self.assertEqual(reconstructed_message, message)
+
     def test_message_to_pymcl_fr_invalid_msg_lengths(self):
         # Test invalid msg_lengths (e.g., too small to fit any character)
         message = "Test"
@@ -1,4 +1,5 @@
 import unittest
+import pymcl
 import modbls
 
 class TestCalculations(unittest.TestCase):
@@ -19,6 +20,10 @@ class TestCalculations(unittest.TestCase):
         bls_signature = modbls.sign(sk1, "message")
         self.assertFalse(modbls.verify(vk2, "message", bls_signature), 'Signature verifies for wrong key.')
 
+    def test_hash_to_g1(self):
+        self.assertEqual(modbls.hash_to_g1("message"), pymcl.G1.hash("message".encode()))
+        self.assertNotEqual(modbls.hash_to_g1("message"), modbls.hash_to_g1("wessage"))
+
     # Test aggregation of signatures
     def test_aggregate_signatures_same_msg_verify(self):
         # Generate key pairs
@@ -56,6 +61,23 @@ class TestCalculations(unittest.TestCase):
             "Aggregated signature does not verify."
         )
 
+    def test_aggregate_signatures_mixed_msg_verify(self):
+        # Several keys per message, plus a message signed by a single key
+        keys = [modbls.key_gen() for _ in range(5)]
+        messages = ["message1", "message2", "message1", "message1", "message2"]
+        sigs = [modbls.sign(sk, m) for (sk, _), m in zip(keys, messages)]
+        ver_keys = [vk for (_, vk) in keys]
+
+        aggregated_signature = modbls.agg_sigs(sigs, ver_keys)
+        self.assertTrue(
+            modbls.agg_verify(aggregated_signature, messages, ver_keys),
+            "Aggregated signature does not verify."
+        )
+        self.assertFalse(
+            modbls.agg_verify(aggregated_signature, messages[:4] + ["message3"], ver_keys),
+            "Aggregated signature for wrong message verifies."
+        )
+
     def test_aggregate_signatures_verify_wrong_message(self):
         # Generate key pairs
         (sk1, vk1) = modbls.key_gen()
@@ -92,5 +114,14 @@ class TestCalculations(unittest.TestCase):
             "Aggregated signature for partial keys verify."
         )
 
+    # Test batched computation of Lagrange coefficients
+    def test_compute_all_li_matches_compute_li(self):
+        xi = [pymcl.Fr.random() for _ in range(6)]
+        self.assertEqual(
+            modbls.compute_all_li(xi),
+            [modbls.compute_li(xi, i) for i in range(len(xi))],
+            "Batched Lagrange coefficients differ from per-index ones."
+        )
+
 if __name__ == '__main__':
     unittest.main()
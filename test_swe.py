@@ -0,0 +1,69 @@
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import pymcl
+import ecutils
+import modbls
+import swe
+
+class TestSWE(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Small message chunks keep the baby-step table cheap to build
+        cls.msg_lengths = 16
+        gt = pymcl.pairing(pymcl.g1, pymcl.g2)  # generator point of GT
+        cls.baby_steps_table = ecutils.build_baby_step_table(gt, 2**cls.msg_lengths)
+
+    def setUp(self):
+        self.num_keys = 5
+        self.dec_threshold = 3
+        self.target_message = "target_msg"
+        modbls_keys = [modbls.key_gen() for _ in range(self.num_keys)]
+        self.sks = [k[0] for k in modbls_keys]
+        self.ver_keys = [k[1] for k in modbls_keys]
+
+    def sign_with(self, used_key_indices, message):
+        sigs = [modbls.sign(self.sks[i], message) for i in used_key_indices]
+        return modbls.agg_sigs(sigs, [self.ver_keys[i] for i in used_key_indices])
+
+    def test_encrypt_decrypt(self):
+        message = "Hello SWE!"
+        msgs = ecutils.message_to_pymcl_fr(message, self.msg_lengths)
+        ctxt = swe.encrypt(self.dec_threshold, self.ver_keys, self.target_message, msgs)
+
+        used_key_indices = sorted(random.sample(range(self.num_keys), self.dec_threshold))
+        aggregated_signature = self.sign_with(used_key_indices, self.target_message)
+        dec_msgs = swe.decrypt(
+            ctxt, aggregated_signature, self.ver_keys, used_key_indices,
+            self.msg_lengths, self.baby_steps_table,
+        )
+        self.assertEqual(dec_msgs, msgs)
+        self.assertEqual(ecutils.pymcl_fr_to_message(dec_msgs, self.msg_lengths), message)
+
+    def test_encrypt_decrypt_with_executor(self):
+        message = "Parallel encryption and decryption"
+        msgs = ecutils.message_to_pymcl_fr(message, self.msg_lengths)
+        used_key_indices = sorted(random.sample(range(self.num_keys), self.dec_threshold))
+        aggregated_signature = self.sign_with(used_key_indices, self.target_message)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            ctxt = swe.encrypt(self.dec_threshold, self.ver_keys, self.target_message, msgs, executor=executor)
+            dec_msgs = swe.decrypt(
+                ctxt, aggregated_signature, self.ver_keys, used_key_indices,
+                self.msg_lengths, self.baby_steps_table, executor=executor,
+            )
+        self.assertEqual(dec_msgs, msgs)
+
+    def test_decrypt_wrong_message_signature(self):
+        msgs = ecutils.message_to_pymcl_fr("Hi", self.msg_lengths)
+        ctxt = swe.encrypt(self.dec_threshold, self.ver_keys, self.target_message, msgs)
+
+        used_key_indices = list(range(self.dec_threshold))
+        aggregated_signature = self.sign_with(used_key_indices, "other_msg")
+        with self.assertRaises(ValueError):
+            swe.decrypt(
+                ctxt, aggregated_signature, self.ver_keys, used_key_indices,
+                self.msg_lengths, self.baby_steps_table,
+            )
+
+if __name__ == "__main__":
+    unittest.main()